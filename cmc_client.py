@@ -0,0 +1,125 @@
+"""
+CoinMarketCap API client shared by crypto_tree.py and main.py
+- Reads API key from .env (CMC_API_KEY)
+- One pooled HTTP/2 client and a per-limit TTL cache for listings
+- Requires: httpx[http2], ijson, python-dotenv
+"""
+
+import os
+import time
+from decimal import Decimal
+import httpx
+import ijson
+from dotenv import load_dotenv
+
+# ===================== Config =====================
+load_dotenv()  # Load .env from current folder
+API_KEY = os.getenv("CMC_API_KEY")
+if not API_KEY:
+    raise ValueError(
+        "API key not found. Create a .env file with:\n\nCMC_API_KEY=your_real_key_here\n"
+        "and make sure python-dotenv is installed."
+    )
+
+LISTINGS_URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/listings/latest"
+QUOTES_URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+CACHE_TTL = 60.0              # seconds; CMC updates listings about once a minute
+
+# One pooled HTTP/2 client so every request reuses the same TLS connection.
+# httpx negotiates compression itself (gzip/deflate, plus br/zstd when a
+# decoder is installed), so Accept-Encoding is left to it.
+CLIENT = httpx.Client(
+    headers={
+        "Accepts": "application/json",
+        "X-CMC_PRO_API_KEY": API_KEY
+    },
+    timeout=20.0,
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,  # connection failures only
+        limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0)
+    )
+)
+
+_BASE_PARAMS = {"start": "1", "convert": "USD"}
+
+# limit -> (monotonic fetch time, listings); only the last fetched limit is kept
+_CACHE: dict[int, tuple[float, list]] = {}
+
+# ===================== Helpers =====================
+class _ByteStream:
+    """Minimal file-like wrapper so ijson can read from an httpx byte iterator."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def read(self, size=-1):
+        if size == 0:
+            return b""  # ijson probes with read(0) to detect bytes vs str
+        # b"" means EOF to ijson, so skip any empty chunks the decoder yields
+        for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+def _num(v):
+    # ijson yields non-integer numbers as Decimal; the UI works in floats
+    return float(v) if isinstance(v, Decimal) else v
+
+def _listing_fields(coin):
+    q = coin.get("quote", {}).get("USD", {})
+    return (
+        coin.get("id"),
+        coin.get("cmc_rank"),
+        coin.get("symbol"),
+        coin.get("name"),
+        _num(q.get("price")),
+        _num(q.get("percent_change_24h")),
+        _num(q.get("percent_change_7d")),
+        _num(q.get("market_cap")),
+        _num(q.get("volume_24h")),
+        q.get("last_updated") or coin.get("last_updated")
+    )
+
+# ===================== API =====================
+def get_listings(limit):
+    """Return the top `limit` coins as field tuples.
+
+    Each tuple is (id, rank, symbol, name, price, pct24h, pct7d, mcap,
+    vol24h, updated). The response is stream-parsed and only these fields
+    are kept. Results for the most recent limit are cached for CACHE_TTL
+    seconds, and the same list object is returned on a cache hit. On error the last good
+    result for that limit is returned if there is one; otherwise the
+    exception propagates.
+    """
+    now = time.monotonic()
+    entry = _CACHE.get(limit)
+    if entry and now - entry[0] < CACHE_TTL:
+        return entry[1]
+
+    params = {**_BASE_PARAMS, "limit": str(limit)}
+    try:
+        with CLIENT.stream("GET", LISTINGS_URL, params=params) as r:
+            if r.is_error:
+                r.read()  # so the error body is available to callers
+            r.raise_for_status()
+            # Default Decimal mode: use_float=True makes yajl2_c fail on integers
+            # above int64, e.g. some meme tokens' total_supply
+            coins = ijson.items(_ByteStream(r.iter_bytes()), "data.item")
+            out = [_listing_fields(coin) for coin in coins]
+    except Exception:
+        if entry:
+            return entry[1]
+        raise
+    _CACHE.clear()  # drop listings for limits no longer in use
+    _CACHE[limit] = (now, out)
+    return out
+
+def get_quote(symbol):
+    """Return the CMC quote dict for `symbol` (USD), or None if it isn't listed.
+
+    Raises httpx.HTTPStatusError on a non-2xx response.
+    """
+    r = CLIENT.get(QUOTES_URL, params={"symbol": symbol, "convert": "USD"})
+    r.raise_for_status()
+    return r.json().get("data", {}).get(symbol)
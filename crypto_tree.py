@@ -1,92 +1,155 @@
 #!/usr/bin/env python3
 """
 Crypto Listings Treeview (CoinMarketCap)
-- Reads API key from .env (CMC_API_KEY)
+- Reads API key from .env (CMC_API_KEY), via cmc_client
 - Tkinter UI with sortable columns, search, refresh, and adjustable limit
+- Requires: numpy, plus cmc_client's dependencies
 """
 
-import os
-import requests
+import threading
+import httpx
+import numpy as np
 import tkinter as tk
 from tkinter import ttk, messagebox
+from collections import namedtuple
 from datetime import datetime
-from dotenv import load_dotenv
+from operator import attrgetter
+from cmc_client import get_listings
 
 # ===================== Config =====================
-load_dotenv()  # Load .env from current folder
-API_KEY = os.getenv("CMC_API_KEY")
-if not API_KEY:
-    raise ValueError(
-        "API key not found. Create a .env file with:\n\nCMC_API_KEY=your_real_key_here\n"
-        "and make sure python-dotenv is installed."
-    )
-
-URL = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/listings/latest"
 DEFAULT_LIMIT = 200           # default number of coins to fetch
 AUTO_REFRESH_MS = 0           # set >0 (e.g., 60000) to auto-refresh every N ms
+WINDOW_ROWS = 200             # rows kept in the tree at once; the rest are paged in on scroll
+WINDOW_EDGE = 30              # page in more rows once the view is this close to the window's edge
+
+# limit -> (listings from cmc_client, Rows built from them); latest limit only
+_ROWS: dict[int, tuple[list, list]] = {}
 
 # ===================== Helpers =====================
-def fetch_listings(limit=DEFAULT_LIMIT):
-    """Return a list of coin dicts (or empty list on error)."""
-    headers = {
-        "Accepts": "application/json",
-        "X-CMC_PRO_API_KEY": API_KEY
-    }
-    params = {
-        "start": "1",
-        "limit": str(limit),
-        "convert": "USD"
-    }
+def fetch_listings(limit=DEFAULT_LIMIT, report=messagebox.showerror):
+    """Return a list of Row records for display (or empty list on error).
+
+    Listings come from cmc_client.get_listings, which caches them; Rows are
+    only rebuilt when it hands back a new list. Errors are passed to
+    report(title, message).
+    """
     try:
-        r = requests.get(URL, headers=headers, params=params, timeout=20)
-        r.raise_for_status()
-        payload = r.json()
-        return payload.get("data", [])
-    except requests.exceptions.HTTPError as e:
-        messagebox.showerror("HTTP Error", f"{e}\n\n{r.text if 'r' in locals() else ''}")
+        listings = get_listings(limit)
+        entry = _ROWS.get(limit)
+        if entry and entry[0] is listings:
+            return entry[1]
+        rows = make_rows(listings)
+        _ROWS.clear()
+        _ROWS[limit] = (listings, rows)
+        return rows
+    except httpx.HTTPStatusError as e:
+        report("HTTP Error", f"{e}\n\n{e.response.text}")
     except Exception as e:
-        messagebox.showerror("Error", str(e))
+        report("Error", str(e))
     return []
 
 def fmt_money(x):
-    try:
-        if x is None:
-            return "-"
-        if x >= 1_000_000_000_000:
-            return f"${x/1_000_000_000_000:,.2f}T"
-        if x >= 1_000_000_000:
-            return f"${x/1_000_000_000:,.2f}B"
-        if x >= 1_000_000:
-            return f"${x/1_000_000:,.2f}M"
-        if x >= 1_000:
-            return f"${x/1_000:,.2f}K"
-        return f"${x:,.2f}"
-    except Exception:
+    if x is None or not isinstance(x, (int, float)):
         return "-"
+    if x >= 1_000_000_000_000:
+        return f"${x/1_000_000_000_000:,.2f}T"
+    if x >= 1_000_000_000:
+        return f"${x/1_000_000_000:,.2f}B"
+    if x >= 1_000_000:
+        return f"${x/1_000_000:,.2f}M"
+    if x >= 1_000:
+        return f"${x/1_000:,.2f}K"
+    return f"${x:,.2f}"
 
 def fmt_price(x):
-    try:
-        if x is None:
-            return "-"
-        # Small-price coins get more precision
-        return f"${x:,.8f}" if x < 1 else f"${x:,.2f}"
-    except Exception:
+    if x is None or not isinstance(x, (int, float)):
         return "-"
+    # Small-price coins get more precision
+    return f"${x:,.8f}" if x < 1 else f"${x:,.2f}"
 
 def fmt_pct(x):
-    try:
-        return f"{x:.2f}%"
-    except Exception:
+    if x is None or not isinstance(x, (int, float)):
         return "-"
+    return f"{x:.2f}%"
 
 def fmt_dt(iso):
+    if not iso or not isinstance(iso, str):
+        return "-"
+    # CMC always sends "YYYY-MM-DDTHH:MM:SS.sssZ"; slice it instead of parsing
+    if iso.endswith("Z") and len(iso) >= 19 and iso[10] == "T":
+        return iso[:10] + " " + iso[11:19]
     try:
-        if not iso:
-            return "-"
         dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
         return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        return iso or "-"
+    except ValueError:
+        return iso
+
+# ----- Vectorized formatters (whole column at once) -----
+def _to_array(values):
+    # Same rule as the scalar formatters: anything that isn't a number shows as "-"
+    return np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=float)
+
+def _with_commas(out, values, big, fmt):
+    # printf-style "%f" has no thousands separator, so the few values that may
+    # round to >= 1000 go through the scalar formatter instead
+    for i in np.flatnonzero(big).tolist():
+        out[i] = fmt(values[i])
+    return out
+
+def fmt_money_column(values):
+    """fmt_money over a list of numbers, returned as a list of strings."""
+    x = _to_array(values)
+    conds = [x >= 1e12, x >= 1e9, x >= 1e6, x >= 1e3]
+    scaled = np.select(conds, [x / 1e12, x / 1e9, x / 1e6, x / 1e3], default=x)
+    suffix = np.select(conds, ["T", "B", "M", "K"], default="")
+    out = np.char.add(np.char.add("$", np.char.mod("%.2f", scaled)), suffix)
+    out = np.where(np.isnan(x), "-", out).tolist()
+    return _with_commas(out, values, np.abs(scaled) >= 999.99, fmt_money)
+
+def fmt_price_column(values):
+    """fmt_price over a list of numbers, returned as a list of strings."""
+    x = _to_array(values)
+    small = x < 1
+    out = np.where(small, np.char.mod("$%.8f", x), np.char.mod("$%.2f", x))
+    out = np.where(np.isnan(x), "-", out).tolist()
+    return _with_commas(out, values, np.abs(x) >= 999.99, fmt_price)
+
+def fmt_pct_column(values):
+    """fmt_pct over a list of numbers, returned as a list of strings."""
+    x = _to_array(values)
+    return np.where(np.isnan(x), "-", np.char.mod("%.2f%%", x)).tolist()
+
+# ----- Row records -----
+# tag, values and hay are the precomputed tree tag, display tuple and lowercase search text
+Row = namedtuple("Row", "id rank symbol name price pct24h pct7d mcap vol24h updated tag values hay")
+
+def row_tag(pct24h):
+    # Tag for percentage columns (green/red)
+    if pct24h is None or not isinstance(pct24h, (int, float)):
+        return "neu"
+    return "pos" if pct24h >= 0 else "neg"
+
+def _row_from(f, fmt):
+    _, rank, symbol, name, _, pct24h, _, _, _, updated = f
+    values = (
+        rank if rank is not None else "",
+        symbol or "",
+        name or "",
+        *fmt,
+        fmt_dt(updated),
+    )
+    return Row(*f, row_tag(pct24h), values, f"{symbol} {name}".lower())
+
+def make_rows(fields):
+    """Build Rows from (id, rank, ..., updated) tuples, formatting whole columns at once."""
+    formatted = zip(
+        fmt_price_column([f[4] for f in fields]),
+        fmt_pct_column([f[5] for f in fields]),
+        fmt_pct_column([f[6] for f in fields]),
+        fmt_money_column([f[7] for f in fields]),
+        fmt_money_column([f[8] for f in fields]),
+    )
+    return [_row_from(f, fmt) for f, fmt in zip(fields, formatted)]
 
 # ===================== UI App =====================
 class App(tk.Tk):
@@ -107,7 +170,8 @@ class App(tk.Tk):
 
         ttk.Label(controls, text=" Search:").pack(side="left", padx=(16, 4))
         self.search_var = tk.StringVar()
-        self.search_var.trace_add("write", lambda *_: self.apply_filter())
+        self._search_after = None
+        self.search_var.trace_add("write", self._on_search)
         ttk.Entry(controls, textvariable=self.search_var, width=34).pack(side="left")
 
         ttk.Label(controls, text="  Auto-refresh (ms):").pack(side="left", padx=(16, 4))
@@ -117,8 +181,16 @@ class App(tk.Tk):
 
         # ----- Treeview -----
         columns = ("rank", "symbol", "name", "price", "pct24h", "pct7d", "mcap", "vol24h", "updated")
-        self.tree = ttk.Treeview(self, columns=columns, show="headings", height=25)
-        self.tree.pack(fill="both", expand=True, padx=8, pady=8)
+        table = ttk.Frame(self)
+        table.pack(fill="both", expand=True, padx=8, pady=8)
+        self.tree = ttk.Treeview(table, columns=columns, show="headings", height=25)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        # The tree only holds a window of rows, so the scrollbar is driven through
+        # proxies that translate between window and full-list positions
+        self.vsb = ttk.Scrollbar(table, orient="vertical", command=self._on_scrollbar)
+        self.vsb.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=self._on_scroll)
 
         headings = {
             "rank": "Rank", "symbol": "Symbol", "name": "Name",
@@ -146,6 +218,19 @@ class App(tk.Tk):
         # Data storage for filtering/sorting
         self.rows_raw = []
         self.current_sort = ("rank", False)  # (column, descending?)
+        self._sorted_views = {}  # (column, descending?) -> rows_raw in that order
+        self._fetching = False
+
+        # Incremental tree state: items are detached, not deleted, so they can be reused
+        self._iids = {}            # row key -> tree iid (attached or detached)
+        self._iid_rows = {}        # tree iid -> Row last rendered into it
+        self._displayed_iids = {}  # row key -> tree iid, attached items only
+        self._order = []           # row keys in current on-screen order
+
+        # Virtual scrolling: _display_rows is the full filtered/sorted list,
+        # of which only WINDOW_ROWS starting at _window_start are in the tree
+        self._display_rows = []
+        self._window_start = 0
 
         # Initial load
         self.refresh()
@@ -160,67 +245,171 @@ class App(tk.Tk):
             messagebox.showerror("Input Error", "Limit must be an integer.")
             return
 
-        data = fetch_listings(limit=limit)
-        self.rows_raw = []
+        # Coalesce rapid Refresh clicks into the request already in flight
+        if self._fetching:
+            return
+        self._fetching = True
+        threading.Thread(target=self._do_fetch_and_store, args=(limit,), daemon=True).start()
+
+    # Fetching and rendering are separate paths: only refresh/auto-refresh
+    # touch the network, while sorting and searching just re-render.
+    def _do_fetch_and_store(self, limit):
+        # Worker thread: no Tk calls here except scheduling back onto the mainloop
+        def report(title, message):
+            self.after(0, messagebox.showerror, title, message)
+
+        data = []
+        try:
+            data = fetch_listings(limit=limit, report=report)
+        finally:
+            # Always hand back to the Tk thread so _fetching gets cleared
+            self.after(0, self._store, data)
+
+    def _store(self, data):
+        self._fetching = False
+        if data is self.rows_raw:
+            return  # served from the TTL cache; nothing on screen would change
+        self.rows_raw = data
+
+        self._sorted_views = {}
+
+        # Drop tree items for coins that are no longer in the listing
+        live = {self._row_key(r) for r in self.rows_raw}
+        gone = [k for k in self._iids if k not in live]
+        if gone:
+            self._delete_items(gone)
+            self._order = [k for k in self._order if k in live]
 
-        for coin in data:
-            q = coin.get("quote", {}).get("USD", {})
-            row = {
-                "rank": coin.get("cmc_rank"),
-                "symbol": coin.get("symbol"),
-                "name": coin.get("name"),
-                "price": q.get("price"),
-                "pct24h": q.get("percent_change_24h"),
-                "pct7d": q.get("percent_change_7d"),
-                "mcap": q.get("market_cap"),
-                "vol24h": q.get("volume_24h"),
-                "updated": q.get("last_updated") or coin.get("last_updated")
-            }
-            self.rows_raw.append(row)
-
-        self.apply_filter()
+        self._do_render()
 
     def apply_filter(self):
+        self._do_render()
+
+    def _do_render(self):
+        # Any pending debounced search is covered by this pass
+        if self._search_after:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+
         query = (self.search_var.get() or "").strip().lower()
 
-        def matches(row):
-            if not query:
-                return True
-            hay = f"{row['symbol']} {row['name']}".lower()
-            return query in hay
-
-        filtered = [r for r in self.rows_raw if matches(r)]
-
-        # Sort using current state
-        col, desc = self.current_sort
-        filtered.sort(key=lambda r: (r[col] is None, r[col]), reverse=desc)
-
-        # repopulate tree
-        self.tree.delete(*self.tree.get_children())
-        for r in filtered:
-            # Tag for percentage columns (green/red)
-            tag = "neu"
-            try:
-                if r["pct24h"] is not None:
-                    tag = "pos" if r["pct24h"] >= 0 else "neg"
-            except Exception:
-                pass
-
-            self.tree.insert(
-                "", "end",
-                values=(
-                    r["rank"] if r["rank"] is not None else "",
-                    r["symbol"] or "",
-                    r["name"] or "",
-                    fmt_price(r["price"]),
-                    fmt_pct(r["pct24h"]),
-                    fmt_pct(r["pct7d"]),
-                    fmt_money(r["mcap"]) if r["mcap"] is not None else "-",
-                    fmt_money(r["vol24h"]) if r["vol24h"] is not None else "-",
-                    fmt_dt(r["updated"]),
-                ),
-                tags=(tag,)
-            )
+        # Filter the cached view for the current sort (sorted once per column/direction)
+        view = self._sorted_view(*self.current_sort)
+        filtered = [r for r in view if query in r.hay] if query else list(view)
+
+        self._display_rows = filtered
+        self._render_window()
+
+    def _clamp_start(self, start):
+        return max(0, min(start, len(self._display_rows) - WINDOW_ROWS))
+
+    def _render_window(self):
+        self._window_start = self._clamp_start(self._window_start)
+        self._sync_tree(self._display_rows[self._window_start:self._window_start + WINDOW_ROWS])
+
+    def _sync_tree(self, rows):
+        # Update the tree incrementally: detach rows that no longer match,
+        # then walk the new order and only move/insert where it differs.
+        # `rows` is already in display order, so one merge pass against the
+        # current order yields every insertion index; no per-row search needed.
+        new_keys = [self._row_key(r) for r in rows]
+        target_set = set(new_keys)
+        for key in self._displayed_iids.keys() - target_set:
+            self.tree.detach(self._displayed_iids.pop(key))
+
+        current = [k for k in self._order if k in self._displayed_iids]
+        placed = set()
+        j = 0
+        for index, (key, r) in enumerate(zip(new_keys, rows)):
+            while j < len(current) and current[j] in placed:
+                j += 1
+            iid = self._iids.get(key)
+            if iid is not None and self._iid_rows[iid] != r:
+                self.tree.item(iid, values=r.values, tags=(r.tag,))
+                self._iid_rows[iid] = r
+
+            if j < len(current) and current[j] == key:
+                # Already in place
+                j += 1
+            elif iid is not None:
+                self.tree.move(iid, "", index)
+            else:
+                iid = self.tree.insert("", index, values=r.values, tags=(r.tag,))
+                self._iids[key] = iid
+                self._iid_rows[iid] = r
+            self._displayed_iids[key] = iid
+            placed.add(key)
+
+        self._order = new_keys
+
+        # Cap the pool of detached items so scrolling through a large list doesn't
+        # end up holding every row in the widget
+        detached = [k for k in self._iids if k not in self._displayed_iids]
+        if len(detached) > WINDOW_ROWS:
+            self._delete_items(detached)
+
+    def _delete_items(self, keys):
+        # Delete by the iids we track rather than asking Tk for get_children()
+        self.tree.delete(*(self._iids[k] for k in keys))
+        for k in keys:
+            self._iid_rows.pop(self._iids.pop(k))
+            self._displayed_iids.pop(k, None)
+
+    def _scroll_to(self, index):
+        # Make row `index` of _display_rows the top visible row, recentring the window on it
+        total = len(self._display_rows)
+        index = max(0, min(index, total - 1))
+        self._window_start = index - WINDOW_ROWS // 3
+        self._render_window()
+        if self._order:
+            self.tree.yview_moveto((index - self._window_start) / len(self._order))
+
+    def _on_scroll(self, first, last):
+        # yscrollcommand from the tree: fractions are relative to the window
+        first, last = float(first), float(last)
+        n = len(self._order)
+        total = len(self._display_rows)
+        start = self._window_start
+        top, bottom = round(first * n), round(last * n)
+        near_top = top < WINDOW_EDGE and start > 0
+        near_bottom = n - bottom < WINDOW_EDGE and start + n < total
+        if (near_top or near_bottom) and self._clamp_start(start + top - WINDOW_ROWS // 3) != start:
+            self._scroll_to(start + top)
+            return  # yview_moveto reports the new position
+        if total:
+            self.vsb.set((start + first * n) / total, (start + last * n) / total)
+        else:
+            self.vsb.set(0.0, 1.0)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        # Scrollbar command: "moveto" is a fraction of the full list; scrolls stay in the tree
+        if action == "moveto":
+            self._scroll_to(round(float(amount) * len(self._display_rows)))
+        else:
+            self.tree.yview_scroll(int(amount), unit)
+
+    def _sorted_view(self, col, desc):
+        view = self._sorted_views.get((col, desc))
+        if view is None:
+            # Missing values sort last ascending and first descending; keeping them
+            # out of the sort means the key is a plain scalar, never None
+            key = attrgetter(col)
+            present = [r for r in self.rows_raw if key(r) is not None]
+            missing = [r for r in self.rows_raw if key(r) is None]
+            present.sort(key=key, reverse=desc)
+            view = missing + present if desc else present + missing
+            self._sorted_views[(col, desc)] = view
+        return view
+
+    @staticmethod
+    def _row_key(r):
+        return r.id if r.id is not None else (r.symbol, r.name)
+
+    def _on_search(self, *_):
+        # Debounce: only the last keystroke in a 120 ms burst re-filters
+        if self._search_after:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(120, self._do_render)
 
     def sort_by(self, col):
         # Toggle direction if same column, else ascending
@@ -229,7 +418,7 @@ class App(tk.Tk):
         else:
             desc = False
         self.current_sort = (col, desc)
-        self.apply_filter()
+        self._do_render()
 
     def apply_auto_refresh(self):
         # Cancel previous schedule
@@ -1,28 +1,17 @@
-import requests
+import httpx
+from cmc_client import get_quote
 
 # --- Ask user for a symbol ---
 symbol = input("Enter the cryptocurrency symbol (e.g., BTC, ETH, DOGE): ").upper()
 
-# --- CoinMarketCap Pro API endpoint ---
-url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
-
-# --- Headers with your API key ---
-headers = {
-    "Accepts": "application/json",
-    "X-CMC_PRO_API_KEY": "cb88e221-51ee-4694-9f62-c12319dfefea"
-}
-
-# --- Parameters: specify the symbol you entered ---
-params = {"symbol": symbol, "convert": "USD"}
-
-# --- Make the request ---
-response = requests.get(url, headers=headers, params=params)
-
-# --- Handle the response ---
-if response.status_code == 200:
-    data = response.json()
-    if symbol in data["data"]:
-        coin = data["data"][symbol]
+# --- Make the request (API key and connection come from cmc_client) ---
+try:
+    coin = get_quote(symbol)
+except httpx.HTTPStatusError as e:
+    print("Error:", e.response.status_code, e.response.text)
+else:
+    # --- Handle the response ---
+    if coin:
         name = coin["name"]
         price = coin["quote"]["USD"]["price"]
         change = coin["quote"]["USD"]["percent_change_24h"]
@@ -34,5 +23,3 @@ if response.status_code == 200:
         print(f"Market Cap: ${market_cap:,.0f}")
     else:
         print("Symbol not found in API response.")
-else:
-    print("Error:", response.status_code, response.text)